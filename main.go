@@ -6,10 +6,17 @@ import (
 	"errors"
 	"fmt"
 	"io"
+	"net/http"
 	"os"
+	"os/signal"
 	"strconv"
+	"sync"
+	"syscall"
 	"time"
 
+	"github.com/aws/aws-sdk-go-v2/aws"
+	"github.com/aws/aws-sdk-go-v2/aws/retry"
+	awshttp "github.com/aws/aws-sdk-go-v2/aws/transport/http"
 	"github.com/aws/aws-sdk-go-v2/config"
 	"github.com/aws/aws-sdk-go-v2/service/autoscaling"
 	"github.com/aws/aws-sdk-go-v2/service/autoscaling/types"
@@ -23,7 +30,12 @@ func main() {
 	root := newRootCmd(nil)
 	root.SilenceErrors = true
 	root.SilenceUsage = true
-	if err := root.Execute(); err != nil {
+	// Ctrl-C or SIGTERM cancels the command context, so a check stops between polls
+	// instead of being killed mid-request.
+	ctx, stop := signal.NotifyContext(context.Background(), os.Interrupt, syscall.SIGTERM)
+	err := root.ExecuteContext(ctx)
+	stop()
+	if err != nil {
 		if !errors.Is(err, errNonSuccessful) {
 			fmt.Fprintln(os.Stderr, err)
 		}
@@ -36,15 +48,92 @@ type refresherFactory func(region string) (*ASGRefresher, error)
 
 // defaultFactory creates an ASGRefresher using the default AWS credential chain.
 func defaultFactory(region string) (*ASGRefresher, error) {
-	opts := []func(*config.LoadOptions) error{}
+	rc, err := defaultClients.get(region)
+	if err != nil {
+		return nil, err
+	}
+	r := NewASGRefresher(rc.client)
+	r.closeIdle = rc.closeIdleConnections
+	return r, nil
+}
+
+// maxRetryAttempts bounds attempts per AWS request, including the first.
+const maxRetryAttempts = 10
+
+// loadAWSConfig resolves the default credential chain and shared config files for region,
+// sending requests through httpClient. The region is applied through config.WithRegion so
+// that credential providers which call STS, such as assume-role and web-identity profiles,
+// resolve in the same region. Requests use the adaptive retry mode, which adds client-side
+// rate limiting when AWS throttles, so long check polls and start-many fan-outs back off
+// instead of failing. The SDK's default transport already enables TCP keep-alive, so
+// pooled connections survive idle periods.
+func loadAWSConfig(region string, httpClient aws.HTTPClient) (aws.Config, error) {
+	opts := []func(*config.LoadOptions) error{
+		config.WithRetryer(func() aws.Retryer {
+			return retry.AddWithMaxAttempts(retry.NewAdaptiveMode(), maxRetryAttempts)
+		}),
+		config.WithAppID("aws-asg"),
+		config.WithHTTPClient(httpClient),
+	}
 	if region != "" {
 		opts = append(opts, config.WithRegion(region))
 	}
-	cfg, err := config.LoadDefaultConfig(context.Background(), opts...)
+	return config.LoadDefaultConfig(context.Background(), opts...)
+}
+
+// regionClient is a cached autoscaling client and the HTTP transport that carries its
+// requests and those of the credential providers derived from its config.
+type regionClient struct {
+	client    *autoscaling.Client
+	transport *http.Transport
+}
+
+// closeIdleConnections closes idle pooled connections on this region's transport.
+// In-flight requests are unaffected; later requests dial new connections.
+func (c *regionClient) closeIdleConnections() {
+	c.transport.CloseIdleConnections()
+}
+
+// clientCache memoizes one autoscaling client per region. load resolves the config for a
+// region; it is a field so tests can build a cache that never reads local AWS setup.
+type clientCache struct {
+	load    func(region string, httpClient aws.HTTPClient) (aws.Config, error)
+	mu      sync.Mutex
+	clients map[string]*regionClient
+}
+
+// newClientCache returns an empty cache that loads config with load.
+func newClientCache(load func(region string, httpClient aws.HTTPClient) (aws.Config, error)) *clientCache {
+	return &clientCache{load: load, clients: map[string]*regionClient{}}
+}
+
+// defaultClients is the process-wide cache used by defaultFactory.
+var defaultClients = newClientCache(loadAWSConfig)
+
+// get returns the autoscaling client for region, loading its config and creating it on
+// first use. SDK clients are safe for concurrent use, so refreshers for the same region
+// share one client and its connection pool instead of reloading config for every
+// refresher. An empty region keeps the region resolved from the environment. Load errors
+// are not cached.
+func (c *clientCache) get(region string) (*regionClient, error) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if rc, ok := c.clients[region]; ok {
+		return rc, nil
+	}
+
+	// Build the transport here instead of leaving it to a BuildableClient. BuildableClient
+	// sends requests on a clone of its transport, so holding this one is the only way
+	// for Close to drain the pool requests actually use. GetTransport returns a transport
+	// with the SDK's default settings.
+	tr := awshttp.NewBuildableClient().GetTransport()
+	cfg, err := c.load(region, &http.Client{Transport: tr})
 	if err != nil {
 		return nil, fmt.Errorf("load AWS config: %w", err)
 	}
-	return NewASGRefresher(autoscaling.NewFromConfig(cfg)), nil
+	rc := &regionClient{client: autoscaling.NewFromConfig(cfg), transport: tr}
+	c.clients[region] = rc
+	return rc, nil
 }
 
 // newRootCmd builds the root cobra command. factory is used to create the refresher;
@@ -60,18 +149,48 @@ func newRootCmd(factory refresherFactory) *cobra.Command {
 		SilenceUsage:  true,
 	}
 	root.AddCommand(newStartCmd(factory))
+	root.AddCommand(newStartManyCmd(factory))
 	root.AddCommand(newCheckCmd(factory))
 	return root
 }
 
+// refreshFlags holds the refresh option flags shared by the start and start-many commands.
+type refreshFlags struct {
+	minHealthyPct  int
+	maxHealthyPct  int
+	instanceWarmup int
+	skipMatching   bool
+	region         string
+}
+
+// register binds the refresh option flags to cmd.
+func (f *refreshFlags) register(cmd *cobra.Command) {
+	cmd.Flags().IntVar(&f.minHealthyPct, "min-healthy-percentage", envIntOrDefault("MIN_HEALTHY_PERCENTAGE", 90), "Minimum percentage of healthy instances during refresh")
+	cmd.Flags().IntVar(&f.maxHealthyPct, "max-healthy-percentage", 0, "Maximum percentage of healthy instances during refresh (100=terminate-and-launch, 101-200=launch-before-termination)")
+	cmd.Flags().IntVar(&f.instanceWarmup, "instance-warmup", 0, "Time in seconds until a new instance is considered warm")
+	cmd.Flags().BoolVar(&f.skipMatching, "skip-matching", true, "Skip instances already using the latest launch template")
+	cmd.Flags().StringVar(&f.region, "region", "", "AWS region (defaults to environment/instance profile)")
+}
+
+// options converts the parsed flags to RefreshOptions, leaving optional values nil unless set.
+func (f *refreshFlags) options(cmd *cobra.Command) RefreshOptions {
+	opts := RefreshOptions{
+		MinHealthyPercentage: f.minHealthyPct,
+		SkipMatching:         f.skipMatching,
+	}
+	if cmd.Flags().Changed("instance-warmup") {
+		w := int32(f.instanceWarmup)
+		opts.InstanceWarmup = &w
+	}
+	if cmd.Flags().Changed("max-healthy-percentage") {
+		m := int32(f.maxHealthyPct)
+		opts.MaxHealthyPercentage = &m
+	}
+	return opts
+}
+
 func newStartCmd(factory refresherFactory) *cobra.Command {
-	var (
-		minHealthyPct  int
-		maxHealthyPct  int
-		instanceWarmup int
-		skipMatching   bool
-		region         string
-	)
+	var flags refreshFlags
 
 	cmd := &cobra.Command{
 		Use:   "start ASG_NAME",
@@ -96,37 +215,66 @@ Examples:
 				return fmt.Errorf("ASG_NAME argument or environment variable required")
 			}
 
-			r, err := factory(region)
+			r, err := factory(flags.region)
 			if err != nil {
 				return err
 			}
+			defer r.Close()
 
-			opts := RefreshOptions{
-				MinHealthyPercentage: minHealthyPct,
-				SkipMatching:         skipMatching,
-			}
-			if cmd.Flags().Changed("instance-warmup") {
-				w := int32(instanceWarmup)
-				opts.InstanceWarmup = &w
-			}
-			if cmd.Flags().Changed("max-healthy-percentage") {
-				m := int32(maxHealthyPct)
-				opts.MaxHealthyPercentage = &m
+			result, err := r.StartRefresh(cmd.Context(), asgName, flags.options(cmd))
+			if err != nil {
+				return err
 			}
+			return writeJSON(cmd.OutOrStdout(), result)
+		},
+	}
+
+	flags.register(cmd)
+
+	return cmd
+}
 
-			result, err := r.StartRefresh(cmd.Context(), asgName, opts)
+func newStartManyCmd(factory refresherFactory) *cobra.Command {
+	var (
+		flags      refreshFlags
+		maxWorkers int
+	)
+
+	cmd := &cobra.Command{
+		Use:   "start-many ASG_NAME...",
+		Short: "Start instance refreshes on several Auto Scaling Groups concurrently",
+		Long: `Start instance refreshes on several Auto Scaling Groups concurrently.
+
+All groups share the same refresh options. Prints a JSON array with one entry per
+refresh that started; exits 1 if any group failed to start.
+
+Examples:
+  aws-asg start-many web-asg worker-asg
+  aws-asg start-many web-asg worker-asg --min-healthy-percentage 80 --max-workers 4`,
+		Args: cobra.MinimumNArgs(1),
+		RunE: func(cmd *cobra.Command, args []string) error {
+			r, err := factory(flags.region)
 			if err != nil {
 				return err
 			}
-			return writeJSON(cmd.OutOrStdout(), result)
+			defer r.Close()
+
+			results, startErr := r.StartRefreshMany(cmd.Context(), args, flags.options(cmd), maxWorkers)
+			started := make([]*StartResult, 0, len(results))
+			for _, result := range results {
+				if result != nil {
+					started = append(started, result)
+				}
+			}
+			if err := writeJSON(cmd.OutOrStdout(), started); err != nil {
+				return err
+			}
+			return startErr
 		},
 	}
 
-	cmd.Flags().IntVar(&minHealthyPct, "min-healthy-percentage", envIntOrDefault("MIN_HEALTHY_PERCENTAGE", 90), "Minimum percentage of healthy instances during refresh")
-	cmd.Flags().IntVar(&maxHealthyPct, "max-healthy-percentage", 0, "Maximum percentage of healthy instances during refresh (100=terminate-and-launch, 101-200=launch-before-termination)")
-	cmd.Flags().IntVar(&instanceWarmup, "instance-warmup", 0, "Time in seconds until a new instance is considered warm")
-	cmd.Flags().BoolVar(&skipMatching, "skip-matching", true, "Skip instances already using the latest launch template")
-	cmd.Flags().StringVar(&region, "region", "", "AWS region (defaults to environment/instance profile)")
+	flags.register(cmd)
+	cmd.Flags().IntVar(&maxWorkers, "max-workers", defaultMaxWorkers, "Maximum number of StartInstanceRefresh requests in flight")
 
 	return cmd
 }
@@ -139,24 +287,37 @@ func newCheckCmd(factory refresherFactory) *cobra.Command {
 	)
 
 	cmd := &cobra.Command{
-		Use:   "check ASG_NAME REFRESH_ID",
-		Short: "Wait for an instance refresh to complete",
-		Long: `Wait for an instance refresh to complete.
+		Use:   "check ASG_NAME REFRESH_ID...",
+		Short: "Wait for instance refreshes to complete",
+		Long: `Wait for one or more instance refreshes on an Auto Scaling Group to complete.
 
 ASG_NAME and REFRESH_ID can also be set via ASG_NAME and INSTANCE_REFRESH_ID
-environment variables. Exits 1 if the refresh does not end in a Successful state.
+environment variables. Exits 1 if any refresh does not end in a Successful state.
+
+With one REFRESH_ID the final refresh is printed as a JSON object. With several,
+all of them are polled with one request per interval and printed as a JSON array
+in argument order.
+
+Per-poll status lines go to stderr when it is a terminal; set ASG_REFRESH_VERBOSE
+to keep them when stderr is redirected.
 
 Examples:
   asg-refresh check my-asg abc-123
-  asg-refresh check my-asg abc-123 --interval 10 --timeout 600`,
-		Args: cobra.RangeArgs(0, 2),
+  asg-refresh check my-asg abc-123 --interval 10 --timeout 600
+  asg-refresh check my-asg abc-123 def-456`,
+		Args: cobra.ArbitraryArgs,
 		RunE: func(cmd *cobra.Command, args []string) error {
 			asgName := argOrEnv(args, 0, "ASG_NAME")
-			refreshID := argOrEnv(args, 1, "INSTANCE_REFRESH_ID")
+			refreshIDs := args[min(len(args), 1):]
+			if len(refreshIDs) == 0 {
+				if id := os.Getenv("INSTANCE_REFRESH_ID"); id != "" {
+					refreshIDs = []string{id}
+				}
+			}
 			if asgName == "" {
 				return fmt.Errorf("ASG_NAME argument or environment variable required")
 			}
-			if refreshID == "" {
+			if len(refreshIDs) == 0 {
 				return fmt.Errorf("REFRESH_ID argument or INSTANCE_REFRESH_ID environment variable required")
 			}
 
@@ -164,31 +325,54 @@ Examples:
 			if err != nil {
 				return err
 			}
+			defer r.Close()
+
+			var statusCallback func(*types.InstanceRefresh)
+			if statusOutputEnabled(cmd.ErrOrStderr()) {
+				statusCallback = func(refresh *types.InstanceRefresh) {
+					pct := int32(0)
+					if refresh.PercentageComplete != nil {
+						pct = *refresh.PercentageComplete
+					}
+					if len(refreshIDs) > 1 {
+						fmt.Fprintf(cmd.ErrOrStderr(), "%s: ", aws.ToString(refresh.InstanceRefreshId))
+					}
+					fmt.Fprintf(cmd.ErrOrStderr(), "Status: %s (%d%% complete)\n", refresh.Status, pct)
+				}
+			}
 
-			statusCallback := func(refresh *types.InstanceRefresh) {
-				pct := int32(0)
-				if refresh.PercentageComplete != nil {
-					pct = *refresh.PercentageComplete
+			pollInterval := time.Duration(interval) * time.Second
+			waitTimeout := time.Duration(timeout) * time.Second
+			if len(refreshIDs) == 1 {
+				result, err := r.WaitForRefresh(cmd.Context(), asgName, refreshIDs[0], pollInterval, waitTimeout, statusCallback)
+				if err != nil {
+					return err
 				}
-				fmt.Fprintf(cmd.ErrOrStderr(), "Status: %s (%d%% complete)\n", refresh.Status, pct)
+				if err := writeJSON(cmd.OutOrStdout(), result); err != nil {
+					return err
+				}
+				if result.Status != types.InstanceRefreshStatusSuccessful {
+					return errNonSuccessful
+				}
+				return nil
 			}
 
-			result, err := r.WaitForRefresh(
-				cmd.Context(),
-				asgName,
-				refreshID,
-				time.Duration(interval)*time.Second,
-				time.Duration(timeout)*time.Second,
-				statusCallback,
-			)
+			refreshes, err := r.WaitForRefreshes(cmd.Context(), asgName, refreshIDs, pollInterval, waitTimeout, statusCallback)
 			if err != nil {
 				return err
 			}
-
-			if err := writeJSON(cmd.OutOrStdout(), result); err != nil {
+			results := make([]*types.InstanceRefresh, len(refreshIDs))
+			allSuccessful := true
+			for i, id := range refreshIDs {
+				results[i] = refreshes[id]
+				if results[i].Status != types.InstanceRefreshStatusSuccessful {
+					allSuccessful = false
+				}
+			}
+			if err := writeJSON(cmd.OutOrStdout(), results); err != nil {
 				return err
 			}
-			if string(result.Status) != "Successful" {
+			if !allSuccessful {
 				return errNonSuccessful
 			}
 			return nil
@@ -196,7 +380,7 @@ Examples:
 	}
 
 	cmd.Flags().StringVar(&region, "region", "", "AWS region (defaults to environment/instance profile)")
-	cmd.Flags().IntVar(&interval, "interval", envIntOrDefault("CHECK_INTERVAL", 30), "Polling interval in seconds")
+	cmd.Flags().IntVar(&interval, "interval", envIntOrDefault("CHECK_INTERVAL", 30), "Maximum polling interval in seconds; polls start at 2s and back off up to this value")
 	cmd.Flags().IntVar(&timeout, "timeout", envIntOrDefault("CHECK_TIMEOUT", 3600), "Maximum wait time in seconds")
 
 	return cmd
@@ -210,6 +394,21 @@ func argOrEnv(args []string, i int, envKey string) string {
 	return os.Getenv(envKey)
 }
 
+// statusOutputEnabled reports whether per-poll status lines should be written to w: always
+// when ASG_REFRESH_VERBOSE is set, otherwise only if w is a terminal. Writers that are not
+// files, such as a buffer passed to SetErr, are always written to.
+func statusOutputEnabled(w io.Writer) bool {
+	if os.Getenv("ASG_REFRESH_VERBOSE") != "" {
+		return true
+	}
+	f, ok := w.(*os.File)
+	if !ok {
+		return true
+	}
+	info, err := f.Stat()
+	return err == nil && info.Mode()&os.ModeCharDevice != 0
+}
+
 // envIntOrDefault returns the integer value of an env var, or def if unset or invalid.
 func envIntOrDefault(key string, def int) int {
 	if v := os.Getenv(key); v != "" {
@@ -220,9 +419,11 @@ func envIntOrDefault(key string, def int) int {
 	return def
 }
 
-// writeJSON encodes v as indented JSON to w.
+// writeJSON encodes v as indented JSON to w. HTML escaping is disabled: the output is
+// never embedded in HTML, and skipping it avoids rewriting <, > and & in status reasons.
 func writeJSON(w io.Writer, v any) error {
 	enc := json.NewEncoder(w)
+	enc.SetEscapeHTML(false)
 	enc.SetIndent("", "  ")
 	return enc.Encode(v)
 }
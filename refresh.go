@@ -2,7 +2,10 @@ package main
 
 import (
 	"context"
+	"errors"
 	"fmt"
+	"math/rand"
+	"sync"
 	"time"
 
 	"github.com/aws/aws-sdk-go-v2/aws"
@@ -16,7 +19,9 @@ type AutoScalingAPI interface {
 	DescribeInstanceRefreshes(ctx context.Context, params *autoscaling.DescribeInstanceRefreshesInput, optFns ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error)
 }
 
-// RefreshOptions configures an instance refresh.
+// RefreshOptions configures an instance refresh. It is read-only to this package:
+// Preferences copies the pointed-to values rather than retaining the pointers, so a
+// single RefreshOptions value can be shared across concurrent StartRefresh calls.
 type RefreshOptions struct {
 	MinHealthyPercentage int
 	MaxHealthyPercentage *int32 // nil = use AWS default (100); >100 enables launch-before-termination
@@ -30,39 +35,108 @@ type StartResult struct {
 	AutoScalingGroupName string `json:"AutoScalingGroupName"`
 }
 
-// terminalStates are refresh statuses that will not progress further.
-var terminalStates = map[string]bool{
-	"Successful":        true,
-	"Failed":            true,
-	"Cancelled":         true,
-	"RollbackSuccessful": true,
-	"RollbackFailed":    true,
+// defaultMaxWorkers bounds concurrent StartRefreshMany requests. It matches the SDK's
+// default idle connections per host, so workers reuse pooled connections.
+const defaultMaxWorkers = 10
+
+// maxDescribeRecords is the largest page size DescribeInstanceRefreshes accepts.
+const maxDescribeRecords = 100
+
+// isTerminal reports whether a refresh in status will not progress further. A switch over
+// the typed constants avoids hashing the status string on every poll.
+func isTerminal(status types.InstanceRefreshStatus) bool {
+	switch status {
+	case types.InstanceRefreshStatusSuccessful,
+		types.InstanceRefreshStatusFailed,
+		types.InstanceRefreshStatusCancelled,
+		types.InstanceRefreshStatusRollbackSuccessful,
+		types.InstanceRefreshStatusRollbackFailed:
+		return true
+	}
+	return false
 }
 
+// defaultInitialInterval is the first delay between polls; later delays double up to the caller's interval.
+const defaultInitialInterval = 2 * time.Second
+
 // ASGRefresher initiates and monitors AWS Auto Scaling Group instance refreshes.
+// Call Close when done with it to release idle HTTP connections.
 type ASGRefresher struct {
-	client AutoScalingAPI
-	sleep  func(time.Duration)
+	client          AutoScalingAPI
+	sleep           func(context.Context, time.Duration) error
+	initialInterval time.Duration
+	closeIdle       func()
 }
 
 // NewASGRefresher creates an ASGRefresher backed by the given AWS client.
 func NewASGRefresher(client AutoScalingAPI) *ASGRefresher {
-	return &ASGRefresher{client: client, sleep: time.Sleep}
+	return &ASGRefresher{client: client, sleep: sleepContext, initialInterval: defaultInitialInterval}
 }
 
-// StartRefresh initiates a rolling instance refresh on the named ASG.
-func (r *ASGRefresher) StartRefresh(ctx context.Context, asgName string, opts RefreshOptions) (*StartResult, error) {
+// Close releases idle HTTP connections in the pool of the refresher's client. Clients are
+// shared per region, so this also drops idle connections for other refreshers in the same
+// region; every refresher stays usable and later requests simply open new connections.
+func (r *ASGRefresher) Close() error {
+	if r.closeIdle != nil {
+		r.closeIdle()
+	}
+	return nil
+}
+
+// Preferences builds the AWS refresh preferences for these options. The result does not
+// alias opts and may be reused across StartInstanceRefresh requests.
+func (opts RefreshOptions) Preferences() *types.RefreshPreferences {
 	prefs := &types.RefreshPreferences{
 		MinHealthyPercentage: aws.Int32(int32(opts.MinHealthyPercentage)),
 		SkipMatching:         aws.Bool(opts.SkipMatching),
 	}
 	if opts.InstanceWarmup != nil {
-		prefs.InstanceWarmup = opts.InstanceWarmup
+		prefs.InstanceWarmup = aws.Int32(*opts.InstanceWarmup)
 	}
 	if opts.MaxHealthyPercentage != nil {
-		prefs.MaxHealthyPercentage = opts.MaxHealthyPercentage
+		prefs.MaxHealthyPercentage = aws.Int32(*opts.MaxHealthyPercentage)
 	}
+	return prefs
+}
+
+// StartRefresh initiates a rolling instance refresh on the named ASG.
+func (r *ASGRefresher) StartRefresh(ctx context.Context, asgName string, opts RefreshOptions) (*StartResult, error) {
+	return r.startRefresh(ctx, asgName, opts.Preferences())
+}
 
+// StartRefreshMany starts rolling instance refreshes on several ASGs concurrently, with at
+// most maxWorkers requests in flight. Results are returned in the order of asgNames; the
+// entry for an ASG that failed to start is nil and its error is joined into the returned error.
+func (r *ASGRefresher) StartRefreshMany(ctx context.Context, asgNames []string, opts RefreshOptions, maxWorkers int) ([]*StartResult, error) {
+	if maxWorkers < 1 {
+		maxWorkers = 1
+	}
+	prefs := opts.Preferences()
+	results := make([]*StartResult, len(asgNames))
+	errs := make([]error, len(asgNames))
+	sem := make(chan struct{}, maxWorkers)
+	var wg sync.WaitGroup
+	for i, asgName := range asgNames {
+		wg.Add(1)
+		sem <- struct{}{}
+		go func(i int, asgName string) {
+			defer wg.Done()
+			defer func() { <-sem }()
+			result, err := r.startRefresh(ctx, asgName, prefs)
+			if err != nil {
+				errs[i] = fmt.Errorf("%s: %w", asgName, err)
+				return
+			}
+			results[i] = result
+		}(i, asgName)
+	}
+	wg.Wait()
+	return results, errors.Join(errs...)
+}
+
+// startRefresh initiates a rolling instance refresh with prebuilt preferences, which are
+// only read, so one prefs value can back many concurrent calls.
+func (r *ASGRefresher) startRefresh(ctx context.Context, asgName string, prefs *types.RefreshPreferences) (*StartResult, error) {
 	out, err := r.client.StartInstanceRefresh(ctx, &autoscaling.StartInstanceRefreshInput{
 		AutoScalingGroupName: aws.String(asgName),
 		Strategy:             types.RefreshStrategyRolling,
@@ -83,6 +157,7 @@ func (r *ASGRefresher) DescribeRefresh(ctx context.Context, asgName, refreshID s
 	out, err := r.client.DescribeInstanceRefreshes(ctx, &autoscaling.DescribeInstanceRefreshesInput{
 		AutoScalingGroupName: aws.String(asgName),
 		InstanceRefreshIds:   []string{refreshID},
+		MaxRecords:           aws.Int32(1),
 	})
 	if err != nil {
 		return nil, fmt.Errorf("describe instance refresh: %w", err)
@@ -93,15 +168,51 @@ func (r *ASGRefresher) DescribeRefresh(ctx context.Context, asgName, refreshID s
 	return &out.InstanceRefreshes[0], nil
 }
 
+// DescribeRefreshes returns the current status of several instance refreshes on one ASG,
+// requesting the largest page size so up to maxDescribeRecords IDs cost a single
+// DescribeInstanceRefreshes call. The result is keyed by refresh ID; IDs that are not
+// found are absent from the map. No request is made for an empty refreshIDs, which AWS
+// would otherwise treat as "every refresh on the group".
+func (r *ASGRefresher) DescribeRefreshes(ctx context.Context, asgName string, refreshIDs []string) (map[string]*types.InstanceRefresh, error) {
+	refreshes := make(map[string]*types.InstanceRefresh, len(refreshIDs))
+	if len(refreshIDs) == 0 {
+		return refreshes, nil
+	}
+	input := &autoscaling.DescribeInstanceRefreshesInput{
+		AutoScalingGroupName: aws.String(asgName),
+		InstanceRefreshIds:   refreshIDs,
+		MaxRecords:           aws.Int32(maxDescribeRecords),
+	}
+	for {
+		out, err := r.client.DescribeInstanceRefreshes(ctx, input)
+		if err != nil {
+			return nil, fmt.Errorf("describe instance refreshes: %w", err)
+		}
+		for i := range out.InstanceRefreshes {
+			refresh := &out.InstanceRefreshes[i]
+			refreshes[aws.ToString(refresh.InstanceRefreshId)] = refresh
+		}
+		if aws.ToString(out.NextToken) == "" {
+			return refreshes, nil
+		}
+		input.NextToken = out.NextToken
+	}
+}
+
 // WaitForRefresh polls DescribeRefresh until a terminal state or the timeout elapses.
-// statusCallback, if non-nil, is called after each poll.
+// statusCallback, if non-nil, is called after each poll. Polls back off exponentially
+// with jitter from the refresher's initial interval up to interval, and the last wait is
+// trimmed so the final poll happens at the deadline rather than after it. The wait
+// between polls returns early with ctx.Err() if ctx is cancelled, so callers can run many
+// waits in goroutines and stop them all through a shared context.
 func (r *ASGRefresher) WaitForRefresh(
 	ctx context.Context,
 	asgName, refreshID string,
 	interval, timeout time.Duration,
 	statusCallback func(*types.InstanceRefresh),
 ) (*types.InstanceRefresh, error) {
-	start := time.Now()
+	deadline := time.Now().Add(timeout) // carries a monotonic reading, so wall-clock jumps don't move it
+	delay := min(r.initialInterval, interval)
 	for {
 		result, err := r.DescribeRefresh(ctx, asgName, refreshID)
 		if err != nil {
@@ -111,13 +222,85 @@ func (r *ASGRefresher) WaitForRefresh(
 			if statusCallback != nil {
 				statusCallback(result)
 			}
-			if terminalStates[string(result.Status)] {
+			if isTerminal(result.Status) {
 				return result, nil
 			}
 		}
-		if time.Since(start) >= timeout {
+		remaining := time.Until(deadline)
+		if remaining <= 0 {
 			return nil, fmt.Errorf("timed out after %.0fs waiting for refresh %s", timeout.Seconds(), refreshID)
 		}
-		r.sleep(interval)
+		if err := r.sleep(ctx, min(delay, remaining)); err != nil {
+			return nil, err
+		}
+		delay = nextPollDelay(delay, interval)
+	}
+}
+
+// nextPollDelay doubles delay, adds up to 10% jitter, and caps the result at maxDelay.
+func nextPollDelay(delay, maxDelay time.Duration) time.Duration {
+	if delay <= 0 {
+		return maxDelay
+	}
+	jitter := time.Duration(rand.Int63n(int64(delay)/10 + 1))
+	return min(maxDelay, 2*delay+jitter)
+}
+
+// sleepContext blocks for d or until ctx is done, whichever comes first.
+func sleepContext(ctx context.Context, d time.Duration) error {
+	t := time.NewTimer(d)
+	defer t.Stop()
+	select {
+	case <-ctx.Done():
+		return ctx.Err()
+	case <-t.C:
+		return nil
+	}
+}
+
+// WaitForRefreshes polls DescribeRefreshes until every refresh reaches a terminal state or
+// the timeout elapses. Each poll is one request covering only the refreshes still pending.
+// statusCallback, if non-nil, is called for every refresh returned by each poll.
+// On timeout the refreshes that did finish are returned alongside the error.
+func (r *ASGRefresher) WaitForRefreshes(
+	ctx context.Context,
+	asgName string,
+	refreshIDs []string,
+	interval, timeout time.Duration,
+	statusCallback func(*types.InstanceRefresh),
+) (map[string]*types.InstanceRefresh, error) {
+	pending := append([]string(nil), refreshIDs...)
+	done := make(map[string]*types.InstanceRefresh, len(refreshIDs))
+	deadline := time.Now().Add(timeout)
+	delay := min(r.initialInterval, interval)
+	for {
+		refreshes, err := r.DescribeRefreshes(ctx, asgName, pending)
+		if err != nil {
+			return nil, err
+		}
+		stillPending := pending[:0]
+		for _, id := range pending {
+			refresh, ok := refreshes[id]
+			if ok && statusCallback != nil {
+				statusCallback(refresh)
+			}
+			if ok && isTerminal(refresh.Status) {
+				done[id] = refresh
+			} else {
+				stillPending = append(stillPending, id)
+			}
+		}
+		pending = stillPending
+		if len(pending) == 0 {
+			return done, nil
+		}
+		remaining := time.Until(deadline)
+		if remaining <= 0 {
+			return done, fmt.Errorf("timed out after %.0fs waiting for %d of %d refreshes", timeout.Seconds(), len(pending), len(refreshIDs))
+		}
+		if err := r.sleep(ctx, min(delay, remaining)); err != nil {
+			return done, err
+		}
+		delay = nextPollDelay(delay, interval)
 	}
 }
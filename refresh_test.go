@@ -3,35 +3,50 @@ package main
 import (
 	"bytes"
 	"context"
+	"encoding/json"
 	"errors"
 	"fmt"
+	"io"
+	"net"
+	"net/http"
+	"net/http/httptest"
 	"os"
+	"reflect"
+	"strings"
+	"sync"
+	"sync/atomic"
 	"testing"
 	"time"
 
 	"github.com/aws/aws-sdk-go-v2/aws"
 	"github.com/aws/aws-sdk-go-v2/service/autoscaling"
 	"github.com/aws/aws-sdk-go-v2/service/autoscaling/types"
+	"github.com/spf13/cobra"
 )
 
-// mockASClient implements AutoScalingAPI for testing.
+// mockASClient implements AutoScalingAPI for testing. It counts calls itself so tests
+// only need custom closures when responses must vary.
 type mockASClient struct {
-	startFn    func(ctx context.Context, params *autoscaling.StartInstanceRefreshInput, optFns ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error)
-	describeFn func(ctx context.Context, params *autoscaling.DescribeInstanceRefreshesInput, optFns ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error)
+	startFn       func(ctx context.Context, params *autoscaling.StartInstanceRefreshInput, optFns ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error)
+	describeFn    func(ctx context.Context, params *autoscaling.DescribeInstanceRefreshesInput, optFns ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error)
+	startCalls    atomic.Int32
+	describeCalls atomic.Int32
 }
 
 func (m *mockASClient) StartInstanceRefresh(ctx context.Context, params *autoscaling.StartInstanceRefreshInput, optFns ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
+	m.startCalls.Add(1)
 	return m.startFn(ctx, params, optFns...)
 }
 
 func (m *mockASClient) DescribeInstanceRefreshes(ctx context.Context, params *autoscaling.DescribeInstanceRefreshesInput, optFns ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+	m.describeCalls.Add(1)
 	return m.describeFn(ctx, params, optFns...)
 }
 
 // newTestRefresher creates an ASGRefresher with a no-op sleep suitable for unit tests.
 func newTestRefresher(client AutoScalingAPI) *ASGRefresher {
 	r := NewASGRefresher(client)
-	r.sleep = func(time.Duration) {}
+	r.sleep = func(context.Context, time.Duration) error { return nil }
 	return r
 }
 
@@ -42,14 +57,86 @@ func makeFactory(client AutoScalingAPI) refresherFactory {
 	}
 }
 
-// ── StartRefresh ─────────────────────────────────────────────────────────────
+// Canned describe results shared by tests; describeReturning copies them, so tests only read them.
+var (
+	completedRefresh  = types.InstanceRefresh{Status: types.InstanceRefreshStatusSuccessful, PercentageComplete: aws.Int32(100)}
+	failedRefresh     = types.InstanceRefresh{Status: types.InstanceRefreshStatusFailed}
+	inProgressRefresh = types.InstanceRefresh{Status: types.InstanceRefreshStatusInProgress}
+)
 
-func TestStartRefresh_Success(t *testing.T) {
-	mock := &mockASClient{
+// startReturning returns a mock whose StartInstanceRefresh returns refresh ID id and,
+// if got is non-nil, stores the request in *got.
+func startReturning(id string, got **autoscaling.StartInstanceRefreshInput) *mockASClient {
+	return &mockASClient{
+		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
+			if got != nil {
+				*got = params
+			}
+			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String(id)}, nil
+		},
+	}
+}
+
+// describeReturning returns a mock whose DescribeInstanceRefreshes always returns refreshes.
+func describeReturning(refreshes ...types.InstanceRefresh) *mockASClient {
+	return &mockASClient{
+		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+			return &autoscaling.DescribeInstanceRefreshesOutput{InstanceRefreshes: refreshes}, nil
+		},
+	}
+}
+
+// failingClient returns a mock whose AWS calls all fail with msg.
+func failingClient(msg string) *mockASClient {
+	return &mockASClient{
 		startFn: func(_ context.Context, _ *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id-123")}, nil
+			return nil, errors.New(msg)
+		},
+		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+			return nil, errors.New(msg)
 		},
 	}
+}
+
+// runCommand executes the root command with args against client and returns its stdout.
+// Stderr is discarded so per-poll status lines don't spill into test output.
+func runCommand(client AutoScalingAPI, args ...string) (string, error) {
+	var out bytes.Buffer
+	root := newRootCmd(makeFactory(client))
+	root.SetOut(&out)
+	root.SetErr(io.Discard)
+	root.SetArgs(args)
+	err := root.Execute()
+	return out.String(), err
+}
+
+// ── Close ─────────────────────────────────────────────────────────────────────
+
+func TestClose_ReleasesIdleConnections(t *testing.T) {
+	t.Parallel()
+	r := newTestRefresher(&mockASClient{})
+	calls := 0
+	r.closeIdle = func() { calls++ }
+	if err := r.Close(); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if calls != 1 {
+		t.Errorf("expected closeIdle to be called once, got %d", calls)
+	}
+}
+
+func TestClose_WithoutTransport(t *testing.T) {
+	t.Parallel()
+	if err := newTestRefresher(&mockASClient{}).Close(); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+}
+
+// ── StartRefresh ─────────────────────────────────────────────────────────────
+
+func TestStartRefresh_Success(t *testing.T) {
+	t.Parallel()
+	mock := startReturning("id-123", nil)
 	result, err := newTestRefresher(mock).StartRefresh(context.Background(), "my-asg", RefreshOptions{MinHealthyPercentage: 90})
 	if err != nil {
 		t.Fatalf("unexpected error: %v", err)
@@ -63,13 +150,9 @@ func TestStartRefresh_Success(t *testing.T) {
 }
 
 func TestStartRefresh_DefaultPreferences(t *testing.T) {
+	t.Parallel()
 	var got *autoscaling.StartInstanceRefreshInput
-	mock := &mockASClient{
-		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			got = params
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
-		},
-	}
+	mock := startReturning("id", &got)
 	_, err := newTestRefresher(mock).StartRefresh(context.Background(), "asg", RefreshOptions{MinHealthyPercentage: 90, SkipMatching: true})
 	if err != nil {
 		t.Fatalf("unexpected error: %v", err)
@@ -89,13 +172,9 @@ func TestStartRefresh_DefaultPreferences(t *testing.T) {
 }
 
 func TestStartRefresh_WithAllOptions(t *testing.T) {
+	t.Parallel()
 	var got *autoscaling.StartInstanceRefreshInput
-	mock := &mockASClient{
-		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			got = params
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
-		},
-	}
+	mock := startReturning("id", &got)
 	warmup := int32(300)
 	maxPct := int32(110)
 	_, err := newTestRefresher(mock).StartRefresh(context.Background(), "asg", RefreshOptions{
@@ -122,13 +201,9 @@ func TestStartRefresh_WithAllOptions(t *testing.T) {
 }
 
 func TestStartRefresh_WithMaxHealthyPercentage(t *testing.T) {
+	t.Parallel()
 	var got *autoscaling.StartInstanceRefreshInput
-	mock := &mockASClient{
-		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			got = params
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
-		},
-	}
+	mock := startReturning("id", &got)
 	maxPct := int32(200)
 	_, err := newTestRefresher(mock).StartRefresh(context.Background(), "asg", RefreshOptions{
 		MinHealthyPercentage: 90,
@@ -142,30 +217,123 @@ func TestStartRefresh_WithMaxHealthyPercentage(t *testing.T) {
 	}
 }
 
+func TestStartRefresh_DoesNotAliasOptions(t *testing.T) {
+	t.Parallel()
+	var got *autoscaling.StartInstanceRefreshInput
+	mock := startReturning("id", &got)
+	warmup := int32(300)
+	opts := RefreshOptions{MinHealthyPercentage: 90, InstanceWarmup: &warmup}
+	if _, err := newTestRefresher(mock).StartRefresh(context.Background(), "asg", opts); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	warmup = 0
+	if *got.Preferences.InstanceWarmup != 300 {
+		t.Errorf("expected request to keep InstanceWarmup=300, got %d", *got.Preferences.InstanceWarmup)
+	}
+}
+
+func TestRefreshOptions_Preferences(t *testing.T) {
+	t.Parallel()
+	maxPct := int32(150)
+	prefs := RefreshOptions{MinHealthyPercentage: 75, MaxHealthyPercentage: &maxPct}.Preferences()
+	if *prefs.MinHealthyPercentage != 75 {
+		t.Errorf("expected 75, got %d", *prefs.MinHealthyPercentage)
+	}
+	if *prefs.SkipMatching {
+		t.Error("expected SkipMatching=false")
+	}
+	if prefs.MaxHealthyPercentage == nil || *prefs.MaxHealthyPercentage != 150 {
+		t.Errorf("expected MaxHealthyPercentage=150, got %v", prefs.MaxHealthyPercentage)
+	}
+	if prefs.MaxHealthyPercentage == &maxPct {
+		t.Error("expected MaxHealthyPercentage to be copied, not aliased")
+	}
+	if prefs.InstanceWarmup != nil {
+		t.Errorf("expected nil InstanceWarmup, got %v", prefs.InstanceWarmup)
+	}
+}
+
 func TestStartRefresh_Error(t *testing.T) {
+	t.Parallel()
+	mock := failingClient("AWS error")
+	_, err := newTestRefresher(mock).StartRefresh(context.Background(), "asg", RefreshOptions{})
+	if err == nil {
+		t.Fatal("expected error, got nil")
+	}
+}
+
+// ── StartRefreshMany ──────────────────────────────────────────────────────────
+
+func TestStartRefreshMany_Success(t *testing.T) {
+	t.Parallel()
+	var (
+		mu        sync.Mutex
+		inFlight  int
+		maxFlight int
+		pairOnce  sync.Once
+	)
+	// Each call waits until two are in flight at once, so a sequential implementation
+	// stalls until the timeout and fails the maxFlight check below.
+	pair := make(chan struct{})
 	mock := &mockASClient{
-		startFn: func(_ context.Context, _ *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			return nil, fmt.Errorf("AWS error")
+		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
+			mu.Lock()
+			inFlight++
+			maxFlight = max(maxFlight, inFlight)
+			if inFlight == 2 {
+				pairOnce.Do(func() { close(pair) })
+			}
+			mu.Unlock()
+			select {
+			case <-pair:
+			case <-time.After(time.Second):
+			}
+			time.Sleep(time.Millisecond)
+			mu.Lock()
+			inFlight--
+			mu.Unlock()
+			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id-" + aws.ToString(params.AutoScalingGroupName))}, nil
 		},
 	}
-	_, err := newTestRefresher(mock).StartRefresh(context.Background(), "asg", RefreshOptions{})
+	names := []string{"a", "b", "c", "d", "e"}
+	results, err := newTestRefresher(mock).StartRefreshMany(context.Background(), names, RefreshOptions{MinHealthyPercentage: 90}, 2)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	for i, name := range names {
+		if results[i].AutoScalingGroupName != name || results[i].InstanceRefreshId != "id-"+name {
+			t.Errorf("result %d: expected %s/id-%s, got %+v", i, name, name, results[i])
+		}
+	}
+	if maxFlight != 2 {
+		t.Errorf("expected exactly 2 requests in flight at peak, got %d", maxFlight)
+	}
+}
+
+func TestStartRefreshMany_PartialFailure(t *testing.T) {
+	t.Parallel()
+	mock := &mockASClient{
+		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
+			if aws.ToString(params.AutoScalingGroupName) == "bad" {
+				return nil, fmt.Errorf("access denied")
+			}
+			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
+		},
+	}
+	results, err := newTestRefresher(mock).StartRefreshMany(context.Background(), []string{"good", "bad"}, RefreshOptions{}, 0)
 	if err == nil {
 		t.Fatal("expected error, got nil")
 	}
+	if results[0] == nil || results[1] != nil {
+		t.Errorf("expected only the first result to be set, got %v", results)
+	}
 }
 
 // ── DescribeRefresh ───────────────────────────────────────────────────────────
 
 func TestDescribeRefresh_Found(t *testing.T) {
-	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
-			return &autoscaling.DescribeInstanceRefreshesOutput{
-				InstanceRefreshes: []types.InstanceRefresh{
-					{InstanceRefreshId: aws.String("id-123"), Status: types.InstanceRefreshStatusSuccessful},
-				},
-			}, nil
-		},
-	}
+	t.Parallel()
+	mock := describeReturning(types.InstanceRefresh{InstanceRefreshId: aws.String("id-123"), Status: types.InstanceRefreshStatusSuccessful})
 	result, err := newTestRefresher(mock).DescribeRefresh(context.Background(), "asg", "id-123")
 	if err != nil {
 		t.Fatalf("unexpected error: %v", err)
@@ -178,7 +346,25 @@ func TestDescribeRefresh_Found(t *testing.T) {
 	}
 }
 
+func TestDescribeRefresh_RequestsSingleRecord(t *testing.T) {
+	t.Parallel()
+	var got *autoscaling.DescribeInstanceRefreshesInput
+	mock := &mockASClient{
+		describeFn: func(_ context.Context, params *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+			got = params
+			return &autoscaling.DescribeInstanceRefreshesOutput{}, nil
+		},
+	}
+	if _, err := newTestRefresher(mock).DescribeRefresh(context.Background(), "asg", "id-123"); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if got.MaxRecords == nil || *got.MaxRecords != 1 {
+		t.Errorf("expected MaxRecords=1, got %v", got.MaxRecords)
+	}
+}
+
 func TestDescribeRefresh_NotFound(t *testing.T) {
+	t.Parallel()
 	mock := &mockASClient{
 		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
 			return &autoscaling.DescribeInstanceRefreshesOutput{}, nil
@@ -194,29 +380,107 @@ func TestDescribeRefresh_NotFound(t *testing.T) {
 }
 
 func TestDescribeRefresh_Error(t *testing.T) {
-	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
-			return nil, fmt.Errorf("AWS error")
-		},
-	}
+	t.Parallel()
+	mock := failingClient("AWS error")
 	_, err := newTestRefresher(mock).DescribeRefresh(context.Background(), "asg", "id-123")
 	if err == nil {
 		t.Fatal("expected error, got nil")
 	}
 }
 
-// ── WaitForRefresh ────────────────────────────────────────────────────────────
+// ── DescribeRefreshes ─────────────────────────────────────────────────────────
 
-func TestWaitForRefresh_ImmediateSuccess(t *testing.T) {
+func TestDescribeRefreshes_SingleRequest(t *testing.T) {
+	t.Parallel()
 	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+		describeFn: func(_ context.Context, params *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+			if len(params.InstanceRefreshIds) != 3 {
+				return nil, fmt.Errorf("expected 3 IDs, got %v", params.InstanceRefreshIds)
+			}
 			return &autoscaling.DescribeInstanceRefreshesOutput{
 				InstanceRefreshes: []types.InstanceRefresh{
-					{Status: types.InstanceRefreshStatusSuccessful, PercentageComplete: aws.Int32(100)},
+					{InstanceRefreshId: aws.String("id-1"), Status: types.InstanceRefreshStatusSuccessful},
+					{InstanceRefreshId: aws.String("id-2"), Status: types.InstanceRefreshStatusInProgress},
 				},
 			}, nil
 		},
 	}
+	result, err := newTestRefresher(mock).DescribeRefreshes(context.Background(), "asg", []string{"id-1", "id-2", "id-3"})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if n := mock.describeCalls.Load(); n != 1 {
+		t.Errorf("expected 1 describe call, got %d", n)
+	}
+	if len(result) != 2 {
+		t.Fatalf("expected 2 results, got %d", len(result))
+	}
+	if result["id-2"].Status != types.InstanceRefreshStatusInProgress {
+		t.Errorf("expected id-2 InProgress, got %s", result["id-2"].Status)
+	}
+	if _, ok := result["id-3"]; ok {
+		t.Error("expected id-3 to be absent")
+	}
+}
+
+func TestDescribeRefreshes_FollowsNextToken(t *testing.T) {
+	t.Parallel()
+	var tokens []string
+	mock := &mockASClient{
+		describeFn: func(_ context.Context, params *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+			tokens = append(tokens, aws.ToString(params.NextToken))
+			if params.NextToken == nil {
+				return &autoscaling.DescribeInstanceRefreshesOutput{
+					InstanceRefreshes: []types.InstanceRefresh{{InstanceRefreshId: aws.String("id-1")}},
+					NextToken:         aws.String("page-2"),
+				}, nil
+			}
+			return &autoscaling.DescribeInstanceRefreshesOutput{
+				InstanceRefreshes: []types.InstanceRefresh{{InstanceRefreshId: aws.String("id-2")}},
+			}, nil
+		},
+	}
+	result, err := newTestRefresher(mock).DescribeRefreshes(context.Background(), "asg", []string{"id-1", "id-2"})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if len(result) != 2 {
+		t.Errorf("expected 2 results, got %d", len(result))
+	}
+	if len(tokens) != 2 || tokens[1] != "page-2" {
+		t.Errorf("expected second request with NextToken page-2, got %v", tokens)
+	}
+}
+
+func TestDescribeRefreshes_NoIDs(t *testing.T) {
+	t.Parallel()
+	mock := describeReturning(completedRefresh)
+	result, err := newTestRefresher(mock).DescribeRefreshes(context.Background(), "asg", nil)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if len(result) != 0 {
+		t.Errorf("expected no results, got %v", result)
+	}
+	if n := mock.describeCalls.Load(); n != 0 {
+		t.Errorf("expected no describe calls, got %d", n)
+	}
+}
+
+func TestDescribeRefreshes_Error(t *testing.T) {
+	t.Parallel()
+	mock := failingClient("AWS error")
+	_, err := newTestRefresher(mock).DescribeRefreshes(context.Background(), "asg", []string{"id-1"})
+	if err == nil {
+		t.Fatal("expected error, got nil")
+	}
+}
+
+// ── WaitForRefresh ────────────────────────────────────────────────────────────
+
+func TestWaitForRefresh_ImmediateSuccess(t *testing.T) {
+	t.Parallel()
+	mock := describeReturning(completedRefresh)
 	result, err := newTestRefresher(mock).WaitForRefresh(context.Background(), "asg", "id", time.Second, time.Minute, nil)
 	if err != nil {
 		t.Fatalf("unexpected error: %v", err)
@@ -227,6 +491,7 @@ func TestWaitForRefresh_ImmediateSuccess(t *testing.T) {
 }
 
 func TestWaitForRefresh_PollsThenSucceeds(t *testing.T) {
+	t.Parallel()
 	callCount := 0
 	mock := &mockASClient{
 		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
@@ -259,13 +524,8 @@ func TestWaitForRefresh_PollsThenSucceeds(t *testing.T) {
 }
 
 func TestWaitForRefresh_TerminalFailed(t *testing.T) {
-	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
-			return &autoscaling.DescribeInstanceRefreshesOutput{
-				InstanceRefreshes: []types.InstanceRefresh{{Status: types.InstanceRefreshStatusFailed}},
-			}, nil
-		},
-	}
+	t.Parallel()
+	mock := describeReturning(failedRefresh)
 	result, err := newTestRefresher(mock).WaitForRefresh(context.Background(), "asg", "id", time.Millisecond, time.Minute, nil)
 	if err != nil {
 		t.Fatalf("unexpected error: %v", err)
@@ -276,13 +536,8 @@ func TestWaitForRefresh_TerminalFailed(t *testing.T) {
 }
 
 func TestWaitForRefresh_Timeout(t *testing.T) {
-	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
-			return &autoscaling.DescribeInstanceRefreshesOutput{
-				InstanceRefreshes: []types.InstanceRefresh{{Status: types.InstanceRefreshStatusInProgress}},
-			}, nil
-		},
-	}
+	t.Parallel()
+	mock := describeReturning(inProgressRefresh)
 	// timeout=0 ensures the deadline is exceeded immediately after the first poll
 	_, err := newTestRefresher(mock).WaitForRefresh(context.Background(), "asg", "id", time.Millisecond, 0, nil)
 	if err == nil {
@@ -290,113 +545,313 @@ func TestWaitForRefresh_Timeout(t *testing.T) {
 	}
 }
 
-func TestWaitForRefresh_DescribeError(t *testing.T) {
-	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
-			return nil, fmt.Errorf("AWS error")
-		},
+func TestWaitForRefresh_SleepTrimmedToDeadline(t *testing.T) {
+	t.Parallel()
+	mock := describeReturning(inProgressRefresh)
+	const timeout = 50 * time.Millisecond
+	var delays []time.Duration
+	r := newTestRefresher(mock)
+	r.sleep = func(_ context.Context, d time.Duration) error {
+		delays = append(delays, d)
+		time.Sleep(d)
+		return nil
+	}
+	_, err := r.WaitForRefresh(context.Background(), "asg", "id", time.Hour, timeout, nil)
+	if err == nil {
+		t.Fatal("expected timeout error, got nil")
+	}
+	if len(delays) == 0 {
+		t.Fatal("expected at least one sleep")
 	}
+	for _, d := range delays {
+		if d > timeout {
+			t.Errorf("expected every sleep to be trimmed to the %v deadline, got %v", timeout, d)
+		}
+	}
+}
+
+func TestWaitForRefresh_DescribeError(t *testing.T) {
+	t.Parallel()
+	mock := failingClient("AWS error")
 	_, err := newTestRefresher(mock).WaitForRefresh(context.Background(), "asg", "id", time.Millisecond, time.Minute, nil)
 	if err == nil {
 		t.Fatal("expected error, got nil")
 	}
 }
 
-// ── start subcommand ──────────────────────────────────────────────────────────
-
-func TestStartCommand_Success(t *testing.T) {
+func TestWaitForRefresh_BacksOffToInterval(t *testing.T) {
+	t.Parallel()
+	callCount := 0
 	mock := &mockASClient{
-		startFn: func(_ context.Context, _ *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id-456")}, nil
+		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+			callCount++
+			status := types.InstanceRefreshStatusInProgress
+			if callCount >= 5 {
+				status = types.InstanceRefreshStatusSuccessful
+			}
+			return &autoscaling.DescribeInstanceRefreshesOutput{
+				InstanceRefreshes: []types.InstanceRefresh{{Status: status}},
+			}, nil
 		},
 	}
-	var out bytes.Buffer
-	root := newRootCmd(makeFactory(mock))
-	root.SetOut(&out)
-	root.SetArgs([]string{"start", "my-asg"})
-	if err := root.Execute(); err != nil {
+	var delays []time.Duration
+	r := newTestRefresher(mock)
+	r.sleep = func(_ context.Context, d time.Duration) error {
+		delays = append(delays, d)
+		return nil
+	}
+	if _, err := r.WaitForRefresh(context.Background(), "asg", "id", 10*time.Second, time.Minute, nil); err != nil {
 		t.Fatalf("unexpected error: %v", err)
 	}
-	if !bytes.Contains(out.Bytes(), []byte("id-456")) {
-		t.Errorf("expected id-456 in output, got: %s", out.String())
+	if len(delays) != 4 {
+		t.Fatalf("expected 4 sleeps, got %v", delays)
+	}
+	if delays[0] != 2*time.Second {
+		t.Errorf("expected first delay 2s, got %v", delays[0])
+	}
+	if delays[1] < 4*time.Second || delays[1] > 4400*time.Millisecond {
+		t.Errorf("expected second delay in [4s, 4.4s], got %v", delays[1])
+	}
+	if delays[3] != 10*time.Second {
+		t.Errorf("expected delay capped at 10s, got %v", delays[3])
 	}
 }
 
-func TestStartCommand_DefaultSkipMatching(t *testing.T) {
-	var got *autoscaling.StartInstanceRefreshInput
+func TestNextPollDelay_CapsAtMax(t *testing.T) {
+	t.Parallel()
+	if got := nextPollDelay(8*time.Second, 10*time.Second); got != 10*time.Second {
+		t.Errorf("expected 10s, got %v", got)
+	}
+	if got := nextPollDelay(0, time.Second); got != time.Second {
+		t.Errorf("expected 1s, got %v", got)
+	}
+}
+
+func TestWaitForRefresh_ContextCancelled(t *testing.T) {
+	t.Parallel()
+	mock := describeReturning(inProgressRefresh)
+	ctx, cancel := context.WithCancel(context.Background())
+	cancel()
+	// uses the real sleep so the cancelled context must cut the hour-long interval short
+	_, err := NewASGRefresher(mock).WaitForRefresh(ctx, "asg", "id", time.Hour, 2*time.Hour, nil)
+	if !errors.Is(err, context.Canceled) {
+		t.Fatalf("expected context.Canceled, got %v", err)
+	}
+}
+
+func TestWaitForRefresh_ConcurrentWaits(t *testing.T) {
+	t.Parallel()
 	mock := &mockASClient{
-		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			got = params
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
+		describeFn: func(_ context.Context, params *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+			return &autoscaling.DescribeInstanceRefreshesOutput{
+				InstanceRefreshes: []types.InstanceRefresh{
+					{InstanceRefreshId: aws.String(params.InstanceRefreshIds[0]), Status: types.InstanceRefreshStatusSuccessful},
+				},
+			}, nil
 		},
 	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"start", "my-asg"})
-	if err := root.Execute(); err != nil {
-		t.Fatalf("unexpected error: %v", err)
+	r := newTestRefresher(mock)
+	ids := []string{"id-1", "id-2", "id-3"}
+	errs := make(chan error, len(ids))
+	for _, id := range ids {
+		go func(id string) {
+			result, err := r.WaitForRefresh(context.Background(), "asg", id, time.Millisecond, time.Minute, nil)
+			if err == nil && aws.ToString(result.InstanceRefreshId) != id {
+				err = fmt.Errorf("expected %s, got %s", id, aws.ToString(result.InstanceRefreshId))
+			}
+			errs <- err
+		}(id)
 	}
-	if !*got.Preferences.SkipMatching {
-		t.Error("expected SkipMatching=true by default")
+	for range ids {
+		if err := <-errs; err != nil {
+			t.Errorf("unexpected error: %v", err)
+		}
 	}
 }
 
-func TestStartCommand_WithOptions(t *testing.T) {
-	var got *autoscaling.StartInstanceRefreshInput
+func TestIsTerminal(t *testing.T) {
+	t.Parallel()
+	for _, status := range []types.InstanceRefreshStatus{
+		types.InstanceRefreshStatusSuccessful,
+		types.InstanceRefreshStatusFailed,
+		types.InstanceRefreshStatusCancelled,
+		types.InstanceRefreshStatusRollbackSuccessful,
+		types.InstanceRefreshStatusRollbackFailed,
+	} {
+		if !isTerminal(status) {
+			t.Errorf("expected %s to be terminal", status)
+		}
+	}
+	for _, status := range []types.InstanceRefreshStatus{
+		types.InstanceRefreshStatusPending,
+		types.InstanceRefreshStatusInProgress,
+		types.InstanceRefreshStatusCancelling,
+		types.InstanceRefreshStatusRollbackInProgress,
+		types.InstanceRefreshStatusBaking,
+	} {
+		if isTerminal(status) {
+			t.Errorf("expected %s to be non-terminal", status)
+		}
+	}
+}
+
+// ── WaitForRefreshes ──────────────────────────────────────────────────────────
+
+func TestWaitForRefreshes_PollsOnlyPending(t *testing.T) {
+	t.Parallel()
+	var polled [][]string
 	mock := &mockASClient{
-		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			got = params
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
+		describeFn: func(_ context.Context, params *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+			polled = append(polled, append([]string(nil), params.InstanceRefreshIds...))
+			var out []types.InstanceRefresh
+			for _, id := range params.InstanceRefreshIds {
+				status := types.InstanceRefreshStatusInProgress
+				if id == "id-1" || len(polled) >= 2 {
+					status = types.InstanceRefreshStatusSuccessful
+				}
+				out = append(out, types.InstanceRefresh{InstanceRefreshId: aws.String(id), Status: status})
+			}
+			return &autoscaling.DescribeInstanceRefreshesOutput{InstanceRefreshes: out}, nil
 		},
 	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"start", "my-asg", "--min-healthy-percentage", "80", "--instance-warmup", "300", "--skip-matching=false"})
-	if err := root.Execute(); err != nil {
+	var callbackCount int
+	result, err := newTestRefresher(mock).WaitForRefreshes(context.Background(), "asg", []string{"id-1", "id-2"}, time.Millisecond, time.Minute, func(*types.InstanceRefresh) {
+		callbackCount++
+	})
+	if err != nil {
 		t.Fatalf("unexpected error: %v", err)
 	}
-	if *got.Preferences.MinHealthyPercentage != 80 {
-		t.Errorf("expected 80, got %d", *got.Preferences.MinHealthyPercentage)
+	if len(result) != 2 {
+		t.Fatalf("expected 2 results, got %d", len(result))
 	}
-	if got.Preferences.InstanceWarmup == nil || *got.Preferences.InstanceWarmup != 300 {
-		t.Errorf("expected InstanceWarmup=300, got %v", got.Preferences.InstanceWarmup)
+	if len(polled) != 2 || len(polled[1]) != 1 || polled[1][0] != "id-2" {
+		t.Errorf("expected second poll to cover only id-2, got %v", polled)
 	}
-	if *got.Preferences.SkipMatching {
-		t.Error("expected SkipMatching=false when explicitly set")
+	if callbackCount != 3 {
+		t.Errorf("expected 3 callback invocations, got %d", callbackCount)
 	}
 }
 
-func TestStartCommand_MaxHealthyPercentage(t *testing.T) {
-	var got *autoscaling.StartInstanceRefreshInput
-	mock := &mockASClient{
-		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			got = params
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
-		},
+func TestWaitForRefreshes_TimeoutReturnsFinished(t *testing.T) {
+	t.Parallel()
+	mock := describeReturning(
+		types.InstanceRefresh{InstanceRefreshId: aws.String("id-1"), Status: types.InstanceRefreshStatusFailed},
+		types.InstanceRefresh{InstanceRefreshId: aws.String("id-2"), Status: types.InstanceRefreshStatusInProgress},
+	)
+	result, err := newTestRefresher(mock).WaitForRefreshes(context.Background(), "asg", []string{"id-1", "id-2"}, time.Millisecond, 0, nil)
+	if err == nil {
+		t.Fatal("expected timeout error, got nil")
 	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"start", "my-asg", "--max-healthy-percentage", "110"})
-	if err := root.Execute(); err != nil {
+	if len(result) != 1 || result["id-1"].Status != types.InstanceRefreshStatusFailed {
+		t.Errorf("expected only id-1 (Failed) in result, got %v", result)
+	}
+}
+
+func TestWaitForRefreshes_DescribeError(t *testing.T) {
+	t.Parallel()
+	mock := failingClient("AWS error")
+	_, err := newTestRefresher(mock).WaitForRefreshes(context.Background(), "asg", []string{"id-1"}, time.Millisecond, time.Minute, nil)
+	if err == nil {
+		t.Fatal("expected error, got nil")
+	}
+}
+
+// ── start subcommand ──────────────────────────────────────────────────────────
+
+func TestStartCommand_Success(t *testing.T) {
+	t.Parallel()
+	mock := startReturning("id-456", nil)
+	out, err := runCommand(mock, "start", "my-asg")
+	if err != nil {
 		t.Fatalf("unexpected error: %v", err)
 	}
-	if got.Preferences.MaxHealthyPercentage == nil || *got.Preferences.MaxHealthyPercentage != 110 {
-		t.Errorf("expected MaxHealthyPercentage=110, got %v", got.Preferences.MaxHealthyPercentage)
+	// the one end-to-end check of the JSON contract; other command tests assert on the captured request
+	var result StartResult
+	if err := json.Unmarshal([]byte(out), &result); err != nil {
+		t.Fatalf("expected JSON output, got %q: %v", out, err)
+	}
+	if result != (StartResult{InstanceRefreshId: "id-456", AutoScalingGroupName: "my-asg"}) {
+		t.Errorf("unexpected output: %+v", result)
 	}
 }
 
-func TestStartCommand_MaxHealthyPercentageNotSetByDefault(t *testing.T) {
-	var got *autoscaling.StartInstanceRefreshInput
-	mock := &mockASClient{
-		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			got = params
-			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
+func TestStartCommand_Preferences(t *testing.T) {
+	t.Parallel()
+	tests := []struct {
+		name string
+		args []string
+		want types.RefreshPreferences
+	}{
+		{
+			name: "defaults",
+			args: []string{"start", "my-asg"},
+			want: types.RefreshPreferences{MinHealthyPercentage: aws.Int32(90), SkipMatching: aws.Bool(true)},
+		},
+		{
+			name: "explicit options",
+			args: []string{"start", "my-asg", "--min-healthy-percentage", "80", "--instance-warmup", "300", "--skip-matching=false"},
+			want: types.RefreshPreferences{MinHealthyPercentage: aws.Int32(80), InstanceWarmup: aws.Int32(300), SkipMatching: aws.Bool(false)},
+		},
+		{
+			name: "max healthy percentage",
+			args: []string{"start", "my-asg", "--max-healthy-percentage", "110"},
+			want: types.RefreshPreferences{MinHealthyPercentage: aws.Int32(90), MaxHealthyPercentage: aws.Int32(110), SkipMatching: aws.Bool(true)},
 		},
 	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"start", "my-asg"})
-	if err := root.Execute(); err != nil {
-		t.Fatalf("unexpected error: %v", err)
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			var got *autoscaling.StartInstanceRefreshInput
+			if _, err := runCommand(startReturning("id", &got), tt.args...); err != nil {
+				t.Fatalf("unexpected error: %v", err)
+			}
+			if !reflect.DeepEqual(*got.Preferences, tt.want) {
+				t.Errorf("expected %s, got %s", formatPreferences(&tt.want), formatPreferences(got.Preferences))
+			}
+		})
 	}
-	if got.Preferences.MaxHealthyPercentage != nil {
-		t.Errorf("expected nil MaxHealthyPercentage by default, got %v", got.Preferences.MaxHealthyPercentage)
+}
+
+// formatPreferences renders the preference fields this tool sets, showing nil pointers as <nil>.
+func formatPreferences(p *types.RefreshPreferences) string {
+	int32Str := func(v *int32) string {
+		if v == nil {
+			return "<nil>"
+		}
+		return fmt.Sprint(*v)
+	}
+	skip := "<nil>"
+	if p.SkipMatching != nil {
+		skip = fmt.Sprint(*p.SkipMatching)
+	}
+	return fmt.Sprintf("{MinHealthy:%s MaxHealthy:%s Warmup:%s SkipMatching:%s}",
+		int32Str(p.MinHealthyPercentage), int32Str(p.MaxHealthyPercentage), int32Str(p.InstanceWarmup), skip)
+}
+
+func TestRefreshFlags_Options(t *testing.T) {
+	t.Parallel()
+	var flags refreshFlags
+	cmd := &cobra.Command{}
+	flags.register(cmd)
+
+	opts := flags.options(cmd)
+	if opts.InstanceWarmup != nil || opts.MaxHealthyPercentage != nil {
+		t.Errorf("expected unset optional flags to stay nil, got %+v", opts)
+	}
+
+	for name, value := range map[string]string{"instance-warmup": "0", "max-healthy-percentage": "150", "skip-matching": "false"} {
+		if err := cmd.Flags().Set(name, value); err != nil {
+			t.Fatalf("set %s: %v", name, err)
+		}
+	}
+	opts = flags.options(cmd)
+	if opts.InstanceWarmup == nil || *opts.InstanceWarmup != 0 {
+		t.Errorf("expected explicit InstanceWarmup=0 to be kept, got %v", opts.InstanceWarmup)
+	}
+	if opts.MaxHealthyPercentage == nil || *opts.MaxHealthyPercentage != 150 {
+		t.Errorf("expected MaxHealthyPercentage=150, got %v", opts.MaxHealthyPercentage)
+	}
+	if opts.SkipMatching {
+		t.Error("expected SkipMatching=false")
 	}
 }
 
@@ -410,74 +865,157 @@ func TestStartCommand_ASGNameFromEnv(t *testing.T) {
 			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id")}, nil
 		},
 	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"start"})
-	if err := root.Execute(); err != nil {
+	if _, err := runCommand(mock, "start"); err != nil {
 		t.Fatalf("unexpected error: %v", err)
 	}
 }
 
 func TestStartCommand_MissingASGName(t *testing.T) {
-	root := newRootCmd(makeFactory(&mockASClient{}))
-	root.SetArgs([]string{"start"})
-	if err := root.Execute(); err == nil {
+	t.Parallel()
+	if _, err := runCommand(&mockASClient{}, "start"); err == nil {
 		t.Fatal("expected error for missing ASG_NAME")
 	}
 }
 
 func TestStartCommand_AWSError(t *testing.T) {
+	t.Parallel()
+	mock := failingClient("access denied")
+	if _, err := runCommand(mock, "start", "my-asg"); err == nil {
+		t.Fatal("expected error from AWS")
+	}
+}
+
+// ── start-many subcommand ─────────────────────────────────────────────────────
+
+func TestStartManyCommand_Success(t *testing.T) {
+	t.Parallel()
 	mock := &mockASClient{
-		startFn: func(_ context.Context, _ *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
-			return nil, fmt.Errorf("access denied")
+		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
+			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id-" + aws.ToString(params.AutoScalingGroupName))}, nil
 		},
 	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"start", "my-asg"})
-	if err := root.Execute(); err == nil {
-		t.Fatal("expected error from AWS")
+	out, err := runCommand(mock, "start-many", "web-asg", "worker-asg", "--min-healthy-percentage", "80")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	for _, id := range []string{"id-web-asg", "id-worker-asg"} {
+		if !strings.Contains(out, id) {
+			t.Errorf("expected %s in output, got: %s", id, out)
+		}
+	}
+}
+
+func TestStartManyCommand_PartialFailure(t *testing.T) {
+	t.Parallel()
+	mock := &mockASClient{
+		startFn: func(_ context.Context, params *autoscaling.StartInstanceRefreshInput, _ ...func(*autoscaling.Options)) (*autoscaling.StartInstanceRefreshOutput, error) {
+			if aws.ToString(params.AutoScalingGroupName) == "bad-asg" {
+				return nil, fmt.Errorf("access denied")
+			}
+			return &autoscaling.StartInstanceRefreshOutput{InstanceRefreshId: aws.String("id-good")}, nil
+		},
+	}
+	out, err := runCommand(mock, "start-many", "good-asg", "bad-asg")
+	if err == nil {
+		t.Fatal("expected error for failed ASG")
+	}
+	if !strings.Contains(out, "id-good") {
+		t.Errorf("expected started refresh in output, got: %s", out)
+	}
+}
+
+func TestStartManyCommand_MissingASGNames(t *testing.T) {
+	t.Parallel()
+	if _, err := runCommand(&mockASClient{}, "start-many"); err == nil {
+		t.Fatal("expected error for missing ASG names")
 	}
 }
 
 // ── check subcommand ──────────────────────────────────────────────────────────
 
 func TestCheckCommand_Success(t *testing.T) {
-	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
-			return &autoscaling.DescribeInstanceRefreshesOutput{
-				InstanceRefreshes: []types.InstanceRefresh{
-					{Status: types.InstanceRefreshStatusSuccessful, PercentageComplete: aws.Int32(100)},
-				},
-			}, nil
-		},
+	t.Parallel()
+	mock := describeReturning(completedRefresh)
+	out, err := runCommand(mock, "check", "my-asg", "id-123")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
 	}
-	var out bytes.Buffer
+	if !strings.Contains(out, "Successful") {
+		t.Errorf("expected Successful in output, got: %s", out)
+	}
+}
+
+func TestCheckCommand_StatusToErrWriter(t *testing.T) {
+	t.Parallel()
+	mock := describeReturning(completedRefresh)
+	var errOut bytes.Buffer
 	root := newRootCmd(makeFactory(mock))
-	root.SetOut(&out)
+	root.SetOut(&bytes.Buffer{})
+	root.SetErr(&errOut)
 	root.SetArgs([]string{"check", "my-asg", "id-123"})
 	if err := root.Execute(); err != nil {
 		t.Fatalf("unexpected error: %v", err)
 	}
-	if !bytes.Contains(out.Bytes(), []byte("Successful")) {
-		t.Errorf("expected Successful in output, got: %s", out.String())
+	if !bytes.Contains(errOut.Bytes(), []byte("Status: Successful (100% complete)")) {
+		t.Errorf("expected status line on stderr, got: %s", errOut.String())
 	}
 }
 
 func TestCheckCommand_NonSuccessful(t *testing.T) {
-	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
-			return &autoscaling.DescribeInstanceRefreshesOutput{
-				InstanceRefreshes: []types.InstanceRefresh{{Status: types.InstanceRefreshStatusFailed}},
-			}, nil
-		},
-	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"check", "my-asg", "id-123"})
-	err := root.Execute()
+	t.Parallel()
+	mock := describeReturning(failedRefresh)
+	_, err := runCommand(mock, "check", "my-asg", "id-123")
 	if !errors.Is(err, errNonSuccessful) {
 		t.Errorf("expected errNonSuccessful, got %v", err)
 	}
 }
 
+func TestCheckCommand_MultipleRefreshIDs(t *testing.T) {
+	t.Parallel()
+	tests := []struct {
+		name     string
+		statuses map[string]types.InstanceRefreshStatus
+		wantErr  error
+	}{
+		{
+			name:     "all successful",
+			statuses: map[string]types.InstanceRefreshStatus{"id-1": types.InstanceRefreshStatusSuccessful, "id-2": types.InstanceRefreshStatusSuccessful},
+		},
+		{
+			name:     "one failed",
+			statuses: map[string]types.InstanceRefreshStatus{"id-1": types.InstanceRefreshStatusSuccessful, "id-2": types.InstanceRefreshStatusFailed},
+			wantErr:  errNonSuccessful,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			mock := &mockASClient{
+				describeFn: func(_ context.Context, params *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
+					var out []types.InstanceRefresh
+					for _, id := range params.InstanceRefreshIds {
+						out = append(out, types.InstanceRefresh{InstanceRefreshId: aws.String(id), Status: tt.statuses[id]})
+					}
+					return &autoscaling.DescribeInstanceRefreshesOutput{InstanceRefreshes: out}, nil
+				},
+			}
+			out, err := runCommand(mock, "check", "my-asg", "id-2", "id-1")
+			if !errors.Is(err, tt.wantErr) {
+				t.Fatalf("expected error %v, got %v", tt.wantErr, err)
+			}
+			var got []types.InstanceRefresh
+			if err := json.Unmarshal([]byte(out), &got); err != nil {
+				t.Fatalf("expected a JSON array, got %q: %v", out, err)
+			}
+			if len(got) != 2 || aws.ToString(got[0].InstanceRefreshId) != "id-2" || aws.ToString(got[1].InstanceRefreshId) != "id-1" {
+				t.Errorf("expected refreshes in argument order, got %s", out)
+			}
+			if n := mock.describeCalls.Load(); n != 1 {
+				t.Errorf("expected one describe call for both IDs, got %d", n)
+			}
+		})
+	}
+}
+
 func TestCheckCommand_FromEnv(t *testing.T) {
 	t.Setenv("ASG_NAME", "env-asg")
 	t.Setenv("INSTANCE_REFRESH_ID", "env-id")
@@ -491,47 +1029,193 @@ func TestCheckCommand_FromEnv(t *testing.T) {
 			}, nil
 		},
 	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"check"})
-	if err := root.Execute(); err != nil {
+	if _, err := runCommand(mock, "check"); err != nil {
 		t.Fatalf("unexpected error: %v", err)
 	}
 }
 
 func TestCheckCommand_MissingASGName(t *testing.T) {
-	root := newRootCmd(makeFactory(&mockASClient{}))
-	root.SetArgs([]string{"check"})
-	if err := root.Execute(); err == nil {
+	t.Parallel()
+	if _, err := runCommand(&mockASClient{}, "check"); err == nil {
 		t.Fatal("expected error for missing ASG_NAME")
 	}
 }
 
 func TestCheckCommand_MissingRefreshID(t *testing.T) {
-	root := newRootCmd(makeFactory(&mockASClient{}))
-	root.SetArgs([]string{"check", "my-asg"})
-	if err := root.Execute(); err == nil {
+	t.Parallel()
+	if _, err := runCommand(&mockASClient{}, "check", "my-asg"); err == nil {
 		t.Fatal("expected error for missing REFRESH_ID")
 	}
 }
 
 func TestCheckCommand_Timeout(t *testing.T) {
-	mock := &mockASClient{
-		describeFn: func(_ context.Context, _ *autoscaling.DescribeInstanceRefreshesInput, _ ...func(*autoscaling.Options)) (*autoscaling.DescribeInstanceRefreshesOutput, error) {
-			return &autoscaling.DescribeInstanceRefreshesOutput{
-				InstanceRefreshes: []types.InstanceRefresh{{Status: types.InstanceRefreshStatusInProgress}},
-			}, nil
-		},
-	}
-	root := newRootCmd(makeFactory(mock))
-	root.SetArgs([]string{"check", "my-asg", "id-123", "--timeout", "0"})
-	if err := root.Execute(); err == nil {
+	t.Parallel()
+	mock := describeReturning(inProgressRefresh)
+	if _, err := runCommand(mock, "check", "my-asg", "id-123", "--timeout", "0"); err == nil {
 		t.Fatal("expected timeout error")
 	}
 }
 
+// ── command wiring ────────────────────────────────────────────────────────────
+
+func TestHelpOutput(t *testing.T) {
+	t.Parallel()
+	tests := []struct {
+		args    []string
+		needles []string
+	}{
+		{[]string{"--help"}, []string{"start", "start-many", "check"}},
+		{[]string{"start", "--help"}, []string{"ASG_NAME", "--min-healthy-percentage", "--max-healthy-percentage", "--instance-warmup", "--skip-matching", "--region"}},
+		{[]string{"start-many", "--help"}, []string{"--max-workers", "--min-healthy-percentage", "--region"}},
+		{[]string{"check", "--help"}, []string{"REFRESH_ID...", "INSTANCE_REFRESH_ID", "--interval", "--timeout", "ASG_REFRESH_VERBOSE"}},
+	}
+	for _, tt := range tests {
+		t.Run(strings.Join(tt.args, " "), func(t *testing.T) {
+			out, err := runCommand(&mockASClient{}, tt.args...)
+			if err != nil {
+				t.Fatalf("unexpected error: %v", err)
+			}
+			for _, needle := range tt.needles {
+				if !strings.Contains(out, needle) {
+					t.Errorf("expected %q in help output, got: %s", needle, out)
+				}
+			}
+		})
+	}
+}
+
+// TestCommands_NoAWSSetupBeforeValidation guards the lazy start-up path: help output and
+// argument errors must return before the factory loads AWS config or builds a client.
+func TestCommands_NoAWSSetupBeforeValidation(t *testing.T) {
+	t.Setenv("ASG_NAME", "")
+	t.Setenv("INSTANCE_REFRESH_ID", "")
+	for _, args := range [][]string{
+		{"--help"},
+		{"start", "--help"},
+		{"start-many", "--help"},
+		{"check", "--help"},
+		{"start"},
+		{"start-many"},
+		{"check", "my-asg"},
+	} {
+		called := false
+		root := newRootCmd(func(string) (*ASGRefresher, error) {
+			called = true
+			return nil, fmt.Errorf("factory should not be called")
+		})
+		root.SetOut(io.Discard)
+		root.SetErr(io.Discard)
+		root.SetArgs(args)
+		_ = root.Execute()
+		if called {
+			t.Errorf("%v: expected factory not to be called", args)
+		}
+	}
+}
+
 // ── helper functions ──────────────────────────────────────────────────────────
 
+func TestClientCache_CachedPerRegion(t *testing.T) {
+	t.Parallel()
+	var loaded []string
+	cache := newClientCache(func(region string, _ aws.HTTPClient) (aws.Config, error) {
+		loaded = append(loaded, region)
+		return aws.Config{Region: region}, nil
+	})
+
+	a, err := cache.get("us-east-1")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	b, err := cache.get("us-east-1")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if a != b {
+		t.Error("expected the same client for repeated calls with one region")
+	}
+	c, err := cache.get("eu-west-1")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if a == c {
+		t.Error("expected distinct clients for distinct regions")
+	}
+	if !reflect.DeepEqual(loaded, []string{"us-east-1", "eu-west-1"}) {
+		t.Errorf("expected config loaded once per region, got %v", loaded)
+	}
+}
+
+func TestClientCache_LoadErrorNotCached(t *testing.T) {
+	t.Parallel()
+	calls := 0
+	cache := newClientCache(func(string, aws.HTTPClient) (aws.Config, error) {
+		calls++
+		return aws.Config{}, errors.New("no credentials")
+	})
+	for i := 0; i < 2; i++ {
+		if _, err := cache.get("us-east-1"); err == nil || !strings.Contains(err.Error(), "no credentials") {
+			t.Errorf("expected load error, got %v", err)
+		}
+	}
+	if calls != 2 {
+		t.Errorf("expected a failed load to be retried, got %d loads", calls)
+	}
+}
+
+func TestClientCache_CloseIdleConnections(t *testing.T) {
+	t.Parallel()
+	closed := make(chan struct{}, 1)
+	srv := httptest.NewUnstartedServer(http.HandlerFunc(func(http.ResponseWriter, *http.Request) {}))
+	srv.Config.ConnState = func(_ net.Conn, state http.ConnState) {
+		if state == http.StateClosed {
+			select {
+			case closed <- struct{}{}:
+			default:
+			}
+		}
+	}
+	srv.Start()
+	defer srv.Close()
+
+	var cfg aws.Config
+	cache := newClientCache(func(region string, httpClient aws.HTTPClient) (aws.Config, error) {
+		cfg = aws.Config{Region: region, HTTPClient: httpClient}
+		return cfg, nil
+	})
+	rc, err := cache.get("us-east-1")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if rc.client.Options().HTTPClient != cfg.HTTPClient {
+		t.Fatal("expected the autoscaling client to send requests through the config's HTTP client")
+	}
+
+	req, err := http.NewRequest(http.MethodGet, srv.URL, nil)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	resp, err := cfg.HTTPClient.Do(req)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	_, _ = io.Copy(io.Discard, resp.Body)
+	resp.Body.Close()
+
+	r := NewASGRefresher(rc.client)
+	r.closeIdle = rc.closeIdleConnections
+	if err := r.Close(); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	select {
+	case <-closed:
+	case <-time.After(5 * time.Second):
+		t.Fatal("expected Close to drop the idle connection")
+	}
+}
+
 func TestArgOrEnv_FromArg(t *testing.T) {
+	t.Parallel()
 	if got := argOrEnv([]string{"from-arg"}, 0, "UNUSED_ENV"); got != "from-arg" {
 		t.Errorf("expected from-arg, got %s", got)
 	}
@@ -544,6 +1228,41 @@ func TestArgOrEnv_FromEnv(t *testing.T) {
 	}
 }
 
+func TestWriteJSON_NoHTMLEscaping(t *testing.T) {
+	t.Parallel()
+	var out bytes.Buffer
+	if err := writeJSON(&out, map[string]string{"StatusReason": "a < b && c > d"}); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	want := "{\n  \"StatusReason\": \"a < b && c > d\"\n}\n"
+	if out.String() != want {
+		t.Errorf("expected %q, got %q", want, out.String())
+	}
+}
+
+func TestStatusOutputEnabled_NonFileWriter(t *testing.T) {
+	t.Setenv("ASG_REFRESH_VERBOSE", "")
+	if !statusOutputEnabled(&bytes.Buffer{}) {
+		t.Error("expected status output for a non-file writer")
+	}
+}
+
+func TestStatusOutputEnabled_RedirectedFile(t *testing.T) {
+	t.Setenv("ASG_REFRESH_VERBOSE", "")
+	f, err := os.CreateTemp(t.TempDir(), "stderr")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	defer f.Close()
+	if statusOutputEnabled(f) {
+		t.Error("expected no status output when stderr is a regular file")
+	}
+	t.Setenv("ASG_REFRESH_VERBOSE", "1")
+	if !statusOutputEnabled(f) {
+		t.Error("expected status output when ASG_REFRESH_VERBOSE is set")
+	}
+}
+
 func TestEnvIntOrDefault_Set(t *testing.T) {
 	t.Setenv("TEST_INT_KEY", "42")
 	if v := envIntOrDefault("TEST_INT_KEY", 0); v != 42 {